@@ -24,6 +24,7 @@ Environment:
 Example:
     python stockmate.py D:/photos/batch --lang en --max-kw 30 --write-iptc --csv out/shutterstock.csv
     python stockmate.py ./in --lang en,zh --max-kw 40 --write-iptc --csv out/adobe.csv
+    python stockmate.py ./in --workers 16 --batch-size 4 --csv out/batch.csv
 
 Notes:
 - JPEG/JPG/TIF are fully supported for IPTC embedding. PNG will export CSV only.
@@ -37,26 +38,44 @@ from __future__ import annotations
 import argparse
 import base64
 import csv
+import io
 import json
+import operator
 import os
 import platform
 import re
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager, redirect_stderr, redirect_stdout
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from PIL import Image
+from PIL import Image, ImageOps
 from tqdm import tqdm
 
-try:
-    from openai import OpenAI
-except Exception:  # pragma: no cover
-    OpenAI = None  # type: ignore
+SUPPORTED_EXTS = frozenset({".jpg", ".jpeg", ".tif", ".tiff", ".png"})
+IPTC_EXTS = frozenset({".jpg", ".jpeg", ".tif", ".tiff"})
+_SUPPORTED_SUFFIXES = tuple(SUPPORTED_EXTS)
 
-SUPPORTED_EXTS = {".jpg", ".jpeg", ".tif", ".tiff", ".png"}
+def is_supported_file(name: str) -> bool:
+    """True if ``name`` (a filename or path string) has a supported image extension."""
+    return name.lower().endswith(_SUPPORTED_SUFFIXES)
+
+def iter_images(root: Path) -> Iterator[Path]:
+    """Recursively yield supported images under ``root``.
+
+    Uses os.walk (scandir-backed) so only matching files become Path objects.
+    """
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            if is_supported_file(name):
+                yield Path(dirpath, name)
 
 # ----------------------------- Data models ----------------------------- #
 
@@ -73,10 +92,10 @@ class Meta:
         if lang_pref == "zh":
             return self._dedupe(self.keywords_zh)
         # both: English first, then Chinese
-        return self._dedupe(self.keywords_en + self.keywords_zh)
+        return self._dedupe(chain(self.keywords_en, self.keywords_zh))
 
     @staticmethod
-    def _dedupe(items: List[str]) -> List[str]:
+    def _dedupe(items: Iterable[str]) -> List[str]:
         seen = set()
         out: List[str] = []
         for k in items:
@@ -96,8 +115,33 @@ def _b64_image(path: Path) -> str:
     with path.open("rb") as f:
         return base64.b64encode(f.read()).decode("utf-8")
 
+def _vision_size(size: Tuple[int, int]) -> Tuple[int, int]:
+    """Size OpenAI's high-detail mode reduces an image to (fit 2048px, shortest side 768px)."""
+    w, h = size
+    scale = min(1.0, 2048 / max(w, h), 768 / min(w, h))
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+def _b64_jpeg_for_vision(path: Path) -> str:
+    """Downscale to what the model actually sees and re-encode as JPEG, so full-size
+    originals (often tens of MB) are never base64-encoded or uploaded."""
+    with Image.open(path) as img:
+        # Camera JPEGs store portraits sideways plus an EXIF Orientation tag that
+        # re-encoding would drop, so size for, and bake in, the upright image.
+        rotated = img.getexif().get(0x0112, 1) in (5, 6, 7, 8)
+        target = _vision_size(img.size[::-1] if rotated else img.size)
+        img.draft("RGB", target[::-1] if rotated else target)  # JPEG: decode at a reduced scale
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(target, Image.LANCZOS)
+        if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, "JPEG", quality=85, optimize=True)
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
 SYSTEM_PROMPT = (
-    "You are a seasoned microstock editor. Given an image, return JSON with: "
+    "You are a seasoned microstock editor. For each image given, return JSON with: "
     "title (<=60 chars, natural, includes important nouns), "
     "description (<=220 chars, specific, no keywords spam), "
     "keywords_en (list, up to {max_kw}, single words/short 2-3 word phrases, ordered by importance; top 10 strongest), "
@@ -105,7 +149,7 @@ SYSTEM_PROMPT = (
     "No salesy words. No private info. Output ONLY JSON."
 )
 
-USER_PROMPT = (
+_USER_RULES = (
     "Task: Analyze the image and produce high-quality stock metadata.\n"
     "Context: Buyers search by specific subjects, objects, locations, styles, moods, seasons, colors, weather, camera angles.\n"
     "Rules:\n"
@@ -114,62 +158,113 @@ USER_PROMPT = (
     " - Prefer nouns and concrete terms; add 2-3 style/mood words when relevant.\n"
     " - Use American English for English keywords.\n"
     " - Chinese should be 简体中文.\n"
-    "Return strict JSON with keys: title, description, keywords_en, keywords_zh."
 )
 
+USER_PROMPT = _USER_RULES + "Return strict JSON with keys: title, description, keywords_en, keywords_zh."
+
+BATCH_PROMPT = (
+    "You are given {n} images. Return strict JSON of the form "
+    '{{"images": [...]}} with exactly {n} objects, one per image in the order given, '
+    "each with keys: title, description, keywords_en, keywords_zh."
+)
+
+# Larger batches risk truncated replies (500 output tokens per image) and one
+# bad reply costs a retry per image, so --batch-size is capped here.
+MAX_BATCH_SIZE = 8
+
+def _openai_client_cls():
+    """Import the OpenAI client on first use (the SDK is slow to import); None if missing."""
+    try:
+        from openai import OpenAI
+    except Exception:  # pragma: no cover
+        return None
+    return OpenAI
+
 class AIGenerator:
-    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.2):
+    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.2, max_retries: int = 5):
+        OpenAI = _openai_client_cls()
         if OpenAI is None:
             raise RuntimeError("openai package not installed. Run: pip install 'openai>=1.40,<2'")
-        self.client = OpenAI()
+        # The SDK retries 429/5xx with jittered exponential backoff; concurrent
+        # batches hit rate limits more often than its default of 2 allows for.
+        self.client = OpenAI(max_retries=max_retries)
         self.model = model
         self.temperature = temperature
 
     def for_image(self, img_path: Path, max_kw: int) -> Meta:
-        sys_prompt = SYSTEM_PROMPT.format(max_kw=max_kw)
-        b64 = _b64_image(img_path)
+        data = self._complete(max_kw, [{"type": "text", "text": USER_PROMPT}, _image_part(img_path)], 500)
+        return _meta_from_dict(data)
+
+    def for_images(self, img_paths: List[Path], max_kw: int) -> List[Meta]:
+        """Describe several images in one request; results follow input order.
+
+        Saves the per-request overhead when batching; a single path falls back to for_image,
+        as does every path when the batched reply cannot be mapped back to the inputs.
+        """
+        if len(img_paths) == 1:
+            return [self.for_image(img_paths[0], max_kw)]
+        # USER_PROMPT's single-object output line would contradict BATCH_PROMPT, so leave it out.
+        text = _USER_RULES + BATCH_PROMPT.format(n=len(img_paths))
+        content = [{"type": "text", "text": text}] + [_image_part(p) for p in img_paths]
+        try:
+            data = self._complete(max_kw, content, 500 * len(img_paths))
+            items = data.get("images")
+            if not isinstance(items, list) or len(items) != len(img_paths):
+                got = len(items) if isinstance(items, list) else 0
+                raise ValueError(f"Model returned {got} results for {len(img_paths)} images")
+            return [_meta_from_dict(d) for d in items]
+        except (ValueError, AttributeError) as e:
+            # Malformed JSON, a wrong count or non-object items: describe each image on its own.
+            # That costs one more request per image, so say so rather than fail silently.
+            tqdm.write(f"[{img_paths[0].name} +{len(img_paths) - 1}] batch reply unusable ({e}); "
+                       "retrying one image per request")
+            return [self.for_image(p, max_kw) for p in img_paths]
+
+    def _complete(self, max_kw: int, content: List[dict], max_tokens: int) -> dict:
         messages = [
-            {"role": "system", "content": sys_prompt},
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": USER_PROMPT},
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/{img_path.suffix[1:].lower()};base64,{b64}",
-                        },
-                    },
-                ],
-            },
+            {"role": "system", "content": SYSTEM_PROMPT.format(max_kw=max_kw)},
+            {"role": "user", "content": content},
         ]
         resp = self.client.chat.completions.create(
             model=self.model,
             temperature=self.temperature,
             messages=messages,
-            max_tokens=500,
+            max_tokens=max_tokens,
         )
         text = resp.choices[0].message.content or "{}"
-        data = _force_json(text)
-        return Meta(
-            title=data.get("title", "").strip(),
-            description=data.get("description", "").strip(),
-            keywords_en=[s.strip() for s in data.get("keywords_en", []) if s and str(s).strip()],
-            keywords_zh=[s.strip() for s in data.get("keywords_zh", []) if s and str(s).strip()],
-        )
+        return _force_json(text)
+
+def _image_part(img_path: Path) -> dict:
+    try:
+        url = f"data:image/jpeg;base64,{_b64_jpeg_for_vision(img_path)}"
+    except Exception:
+        # Modes Pillow cannot convert (e.g. some 16-bit TIFFs): send the original.
+        url = f"data:image/{img_path.suffix[1:].lower()};base64,{_b64_image(img_path)}"
+    return {"type": "image_url", "image_url": {"url": url}}
+
+def _meta_from_dict(data: dict) -> Meta:
+    return Meta(
+        title=data.get("title", "").strip(),
+        description=data.get("description", "").strip(),
+        keywords_en=[s.strip() for s in data.get("keywords_en", []) if s and str(s).strip()],
+        keywords_zh=[s.strip() for s in data.get("keywords_zh", []) if s and str(s).strip()],
+    )
 
 # ----------------------------- Utilities ------------------------------- #
 
+_RX_FENCE = re.compile(r"^```[a-zA-Z]*")
+_RX_JSON_OBJECT = re.compile(r"\{.*\}", flags=re.S)
+
 def _force_json(s: str) -> dict:
     s = (s or "").strip()
     if s.startswith("```"):
-        s = re.sub(r"^```[a-zA-Z]*", "", s).strip()
+        s = _RX_FENCE.sub("", s).strip()
         s = s[:-3] if s.endswith("```") else s
     try:
         return json.loads(s)
     except Exception:
         # Try to find the first JSON object
-        m = re.search(r"\{.*\}", s, flags=re.S)
+        m = _RX_JSON_OBJECT.search(s)
         if m:
             try:
                 return json.loads(m.group(0))
@@ -186,24 +281,25 @@ def has_exiftool() -> bool:
     except Exception:
         return False
 
-def write_iptc(img: Path, title: str, description: str, keywords: List[str]) -> Tuple[bool, str]:
-    """Write IPTC ObjectName (Title), Caption-Abstract (Description), and Keywords using exiftool.
-    Returns (ok, message)."""
-    if img.suffix.lower() not in {".jpg", ".jpeg", ".tif", ".tiff"}:
-        return False, "IPTC embedding is supported for JPEG/TIFF only; skipped"
-    if not has_exiftool():
-        return False, "ExifTool not found; skipped IPTC write"
-    # Build command
-    cmd = [
-        "exiftool",
+def _iptc_args(title: str, description: str, keywords: List[str]) -> List[str]:
+    args = [
         "-overwrite_original",
         f"-IPTC:ObjectName={title[:60]}",
         f"-IPTC:Caption-Abstract={description[:220]}",
     ]
     for kw in keywords:
         if kw:
-            cmd.append(f"-IPTC:Keywords={kw}")
-    cmd.append(str(img))
+            args.append(f"-IPTC:Keywords={kw}")
+    return args
+
+def write_iptc(img: Path, title: str, description: str, keywords: List[str]) -> Tuple[bool, str]:
+    """Write IPTC ObjectName (Title), Caption-Abstract (Description), and Keywords using exiftool.
+    Returns (ok, message)."""
+    if img.suffix.lower() not in IPTC_EXTS:
+        return False, "IPTC embedding is supported for JPEG/TIFF only; skipped"
+    if not has_exiftool():
+        return False, "ExifTool not found; skipped IPTC write"
+    cmd = ["exiftool"] + _iptc_args(title, description, keywords) + [str(img)]
     try:
         r = subprocess.run(cmd, capture_output=True, text=True)
         if r.returncode != 0:
@@ -212,16 +308,98 @@ def write_iptc(img: Path, title: str, description: str, keywords: List[str]) ->
     except Exception as e:
         return False, f"ExifTool failed: {e}"
 
+_RX_EXIFTOOL_OK = re.compile(r"^1 image files (updated|unchanged)", flags=re.M)
+
+class ExifToolSession:
+    """A single ``exiftool -stay_open`` process reused for a whole batch.
+
+    Launching ExifTool costs a Perl start-up per call; this pays it once. ``write_iptc``
+    mirrors the module-level function and is safe to call from several threads.
+    """
+
+    def __init__(self) -> None:
+        self._proc = subprocess.Popen(
+            ["exiftool", "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+        )
+        self._lock = threading.Lock()
+
+    def write_iptc(self, img: Path, title: str, description: str, keywords: List[str]) -> Tuple[bool, str]:
+        if img.suffix.lower() not in IPTC_EXTS:
+            return False, "IPTC embedding is supported for JPEG/TIFF only; skipped"
+        # Argfile syntax is one argument per line.
+        args = ["-charset", "filename=utf8"] + _iptc_args(title, description, keywords) + [str(img)]
+        payload = "\n".join(" ".join(a.splitlines()) for a in args) + "\n-execute\n"
+        try:
+            with self._lock:
+                self._proc.stdin.write(payload)
+                self._proc.stdin.flush()
+                out = []
+                for line in self._proc.stdout:
+                    if line.strip() == "{ready}":
+                        break
+                    out.append(line.strip())
+                else:
+                    return False, "ExifTool exited unexpectedly"
+        except Exception as e:
+            return False, f"ExifTool failed: {e}"
+        text = "\n".join(line for line in out if line)
+        if _RX_EXIFTOOL_OK.search(text):
+            return True, "IPTC written"
+        return False, f"ExifTool error: {text}"
+
+    def close(self) -> None:
+        if self._proc.poll() is not None:
+            return
+        try:
+            self._proc.stdin.write("-stay_open\nFalse\n")
+            self._proc.stdin.flush()
+            self._proc.wait(timeout=10)
+        except Exception:
+            self._proc.kill()
+
+    def __enter__(self) -> "ExifToolSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 # ----------------------------- CSV export ------------------------------ #
 
-def export_csv(rows: List[dict], out_path: Path) -> None:
+CSV_FIELDS = ("filename", "title", "description", "keywords")
+_csv_row = operator.itemgetter(*CSV_FIELDS)
+
+class _CSVStream:
+    """Row sink that flushes after every write so partial batches survive.
+
+    Rows are sequences in CSV_FIELDS order, which skips DictWriter's per-field lookups.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._w = csv.writer(f)
+        self._w.writerow(CSV_FIELDS)
+
+    def writerow(self, row: Sequence[str]) -> None:
+        self._w.writerow(row)
+        self._f.flush()
+
+@contextmanager
+def open_csv(out_path: Path) -> Iterator[_CSVStream]:
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = ["filename", "title", "description", "keywords"]
     with out_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        yield _CSVStream(f)
+
+def export_csv(rows: Iterable[dict], out_path: Path) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(CSV_FIELDS)
+        w.writerows(map(_csv_row, rows))
 
 # ----------------------------- Debug helpers --------------------------- #
 
@@ -238,6 +416,7 @@ def debug_info(model: str) -> None:
     print("ExifTool in PATH:", has_exiftool())
     # Connectivity test (tiny):
     try:
+        OpenAI = _openai_client_cls()
         client = OpenAI() if OpenAI is not None else None
         if client is None:
             raise RuntimeError("openai package not installed")
@@ -287,7 +466,119 @@ def run_selftests() -> int:
         ok, msg = write_iptc(p, "t", "d", ["k"]) 
         assert ok is False and "JPEG/TIFF" in msg
 
-    # 7) parse_args smoke test
+    # 7) Vision payload is downscaled, upright JPEG; alpha is flattened onto white
+    assert _vision_size((6000, 4000)) == (1152, 768) and _vision_size((500, 300)) == (500, 300)
+    with tempfile.TemporaryDirectory() as td:
+        p = Path(td) / "big.png"
+        Image.new("RGBA", (3000, 2000), (0, 0, 0, 0)).save(p)
+        with Image.open(io.BytesIO(base64.b64decode(_b64_jpeg_for_vision(p)))) as small:
+            assert small.format == "JPEG" and small.size == (1152, 768)
+            assert small.getpixel((0, 0)) == (255, 255, 255)
+        # EXIF Orientation=6 (rotate 90° CW): raw left half ends up on top
+        p = Path(td) / "portrait.jpg"
+        raw = Image.new("RGB", (3000, 1000), (0, 0, 255))
+        raw.paste((255, 0, 0), (0, 0, 1500, 1000))
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        raw.save(p, exif=exif)
+        with Image.open(io.BytesIO(base64.b64decode(_b64_jpeg_for_vision(p)))) as small:
+            assert small.size == (683, 2048) and small.getexif().get(0x0112, 1) == 1
+            top, bottom = small.getpixel((341, 100)), small.getpixel((341, 1948))
+            assert top[0] > 200 > top[2] and bottom[2] > 200 > bottom[0]
+
+    # 8) Streamed CSV keeps rows written before an interruption
+    with tempfile.TemporaryDirectory() as td:
+        out = Path(td) / "sub" / "out.csv"
+        try:
+            with open_csv(out) as w:
+                w.writerow(("a.jpg", "t", "d", "k"))
+                raise KeyboardInterrupt
+        except KeyboardInterrupt:
+            pass
+        with out.open(newline="", encoding="utf-8") as f:
+            assert [r["filename"] for r in csv.DictReader(f)] == ["a.jpg"]
+        # export_csv writes pre-built dict rows in CSV_FIELDS order
+        row = {"keywords": "k", "title": "t", "filename": "b.jpg", "description": "d"}
+        export_csv([row], out)
+        with out.open(newline="", encoding="utf-8") as f:
+            assert list(csv.reader(f)) == [list(CSV_FIELDS), ["b.jpg", "t", "d", "k"]]
+
+    # 9) Supported-extension check & folder discovery
+    assert is_supported_file("a.JPG") and is_supported_file("b.tiff")
+    assert not is_supported_file("c.gif") and not is_supported_file("jpg")
+    with tempfile.TemporaryDirectory() as td:
+        (Path(td) / "sub").mkdir()
+        for name in ("a.jpg", "sub/b.PNG", "c.gif"):
+            (Path(td) / name).touch()
+        assert sorted(p.name for p in iter_images(Path(td))) == ["a.jpg", "b.PNG"]
+
+    # 10) for_images maps a batched reply back to input order (stub client)
+    class _StubClient:
+        def __init__(self, reply: str):
+            msg = type("M", (), {"content": reply})
+            resp = type("R", (), {"choices": [type("C", (), {"message": msg})]})
+            self.chat = type("Chat", (), {"completions": type("Comp", (), {"create": lambda *a, **k: resp})})
+
+    with tempfile.TemporaryDirectory() as td:
+        paths = [Path(td) / n for n in ("a.jpg", "b.jpg")]
+        for p in paths:
+            Image.new("RGB", (1, 1)).save(p)
+        gen = AIGenerator.__new__(AIGenerator)
+        gen.model, gen.temperature = "stub", 0.0
+        gen.client = _StubClient('{"images": [{"title": "A"}, {"title": "B"}]}')
+        assert [m.title for m in gen.for_images(paths, 5)] == ["A", "B"]
+        # A wrong count falls back to one request per image, and says so
+        replies = iter(['{"images": [{"title": "A"}]}', '{"title": "a"}', '{"title": "b"}'])
+        texts = []
+
+        def _complete(max_kw: int, content: List[dict], max_tokens: int) -> dict:
+            texts.append(content[0]["text"])
+            return _force_json(next(replies))
+
+        gen._complete = _complete
+        with redirect_stdout(io.StringIO()) as log:
+            assert [m.title for m in gen.for_images(paths, 5)] == ["a", "b"]
+        assert "retrying one image per request" in log.getvalue()
+        # The batched prompt asks only for the {"images": [...]} form
+        assert '"images"' in texts[0] and "Return strict JSON with keys" not in texts[0]
+
+    # 11) process_folder writes CSV rows in input order, and keeps finished rows on interrupt
+    class _StubGen:
+        interrupt = False
+
+        def __init__(self, **kwargs):
+            pass
+
+        def for_images(self, img_paths: List[Path], max_kw: int) -> List[Meta]:
+            # Earlier images finish last, so completion order is the reverse of input order.
+            time.sleep(0.03 * (len(order) - order.index(img_paths[0].name)))
+            if self.interrupt and img_paths[0].name == order[0]:
+                raise KeyboardInterrupt  # surfaces on the main thread via fut.result()
+            return [Meta(p.stem, "d", ["k"], []) for p in img_paths]
+
+    real_gen = AIGenerator
+    globals()["AIGenerator"] = _StubGen
+    try:
+        with tempfile.TemporaryDirectory() as td, redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            in_dir, out = Path(td) / "in", Path(td) / "out.csv"
+            in_dir.mkdir()
+            for n in ("a.jpg", "b.jpg", "c.jpg", "d.jpg"):
+                Image.new("RGB", (1, 1)).save(in_dir / n)
+            order = [p.name for p in iter_images(in_dir)]
+            for interrupt in (False, True):
+                _StubGen.interrupt = interrupt
+                try:
+                    process_folder(in_dir, "en", 5, False, out, "stub", 0.0, False, workers=4)
+                    assert not interrupt
+                except KeyboardInterrupt:
+                    assert interrupt
+                with out.open(newline="", encoding="utf-8") as f:
+                    got = [r["filename"] for r in csv.DictReader(f)]
+                assert got == (order[1:] if interrupt else order), got
+    finally:
+        globals()["AIGenerator"] = real_gen
+
+    # 12) parse_args smoke test
     ap = parse_args(["./in", "--lang", "en,zh", "--max-kw", "30"]) 
     assert ap.lang == "en,zh" and ap.max_kw == 30
 
@@ -305,43 +596,81 @@ def process_folder(
     model: str,
     temperature: float,
     debug: bool,
+    batch_size: int = 1,
+    workers: int = 8,
 ) -> None:
     if debug:
         debug_info(model)
 
-    images = [p for p in in_dir.rglob("*") if p.suffix.lower() in SUPPORTED_EXTS]
+    images = list(iter_images(in_dir))
     if not images:
         print("No images found.")
         return
 
     ai = AIGenerator(model=model, temperature=temperature)
-    rows: List[dict] = []
 
-    for p in tqdm(images, desc="Processing", unit="img"):
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    batches = [images[i : i + batch_size] for i in range(0, len(images), batch_size)]
+
+    # Rows are written in input order as soon as every earlier batch is done; a slow
+    # batch holds back the rows behind it. On an interrupt or error, every finished
+    # row is still written before the CSV is closed.
+    with ExitStack() as stack:
+        csv_out = stack.enter_context(open_csv(csv_path)) if csv_path else None
+        # One long-lived ExifTool serves the batch; without it write_iptc explains the skip.
+        exiftool = stack.enter_context(ExifToolSession()) if write_iptc_flag and has_exiftool() else None
+        iptc_writer = exiftool.write_iptc if exiftool else write_iptc
+        pbar = stack.enter_context(tqdm(total=len(images), desc="Processing", unit="img"))
+        # Model calls are network-bound, so they run in a pool; IPTC and CSV writes
+        # stay on this thread. If the loop is interrupted (e.g. Ctrl-C), queued batches
+        # are cancelled and nothing waits on the requests already sent: their results
+        # are discarded, though the interpreter still lets them finish before exiting.
+        ex = ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches))))
+        stack.callback(ex.shutdown, wait=False, cancel_futures=True)
+        futures = {ex.submit(ai.for_images, batch, max_kw): i for i, batch in enumerate(batches)}
+        # Batches finish out of order; their CSV rows wait here until earlier batches are written.
+        pending: Dict[int, List[Tuple[str, str, str, str]]] = {}
+        next_batch = 0
         try:
-            meta = ai.for_image(p, max_kw=max_kw)
-            # Cap keywords for Adobe (49). Shutterstock accepts up to 50.
-            kws = meta.merged_keywords(lang)[: max_kw]
-            title = meta.title
-            desc = meta.description
-
-            if write_iptc_flag:
-                ok, msg = write_iptc(p, title, desc, kws)
-                tqdm.write(f"[{p.name}] IPTC: {msg}")
-
-            rows.append(
-                {
-                    "filename": p.name,
-                    "title": title,
-                    "description": desc,
-                    "keywords": "; ".join(kws),  # semi-colon separated
-                }
-            )
-        except Exception as e:
-            tqdm.write(f"[{p.name}] ERROR: {e}")
+            for fut in as_completed(futures):
+                i = futures[fut]
+                batch = batches[i]
+                rows = pending[i] = []
+                try:
+                    metas = fut.result()
+                except Exception as e:
+                    for p in batch:
+                        tqdm.write(f"[{p.name}] ERROR: {e}")
+                    pbar.update(len(batch))
+                    metas = []
+                for p, meta in zip(batch, metas):
+                    try:
+                        # Cap keywords for Adobe (49). Shutterstock accepts up to 50.
+                        kws = meta.merged_keywords(lang)[: max_kw]
+                        title = meta.title
+                        desc = meta.description
+
+                        if write_iptc_flag:
+                            ok, msg = iptc_writer(p, title, desc, kws)
+                            tqdm.write(f"[{p.name}] IPTC: {msg}")
+
+                        if csv_out is not None:
+                            # CSV_FIELDS order; keywords are semi-colon separated
+                            rows.append((p.name, title, desc, "; ".join(kws)))
+                    except Exception as e:
+                        tqdm.write(f"[{p.name}] ERROR: {e}")
+                    pbar.update(1)
+                while next_batch in pending:
+                    for row in pending.pop(next_batch):
+                        csv_out.writerow(row)
+                    next_batch += 1
+        finally:
+            # Rows held back by an unfinished earlier batch are written rather than lost.
+            for i in sorted(pending):
+                for row in pending[i]:
+                    csv_out.writerow(row)
 
     if csv_path:
-        export_csv(rows, csv_path)
         print(f"CSV saved: {csv_path}")
 
 # ----------------------------- CLI ------------------------------------ #
@@ -355,6 +684,8 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     ap.add_argument("--csv", type=str, default=None, help="Optional path to export a CSV (e.g., out/shutterstock.csv)")
     ap.add_argument("--model", type=str, default="gpt-4o-mini", help="OpenAI vision model (default gpt-4o-mini)")
     ap.add_argument("--temperature", type=float, default=0.2, help="Sampling temperature (default 0.2)")
+    ap.add_argument("--workers", type=int, default=8, help="Concurrent model requests (default 8)")
+    ap.add_argument("--batch-size", type=int, default=1, help=f"Images described per model request (default 1, max {MAX_BATCH_SIZE})")
     ap.add_argument("--debug", action="store_true", help="Print environment & model connectivity diagnostics")
     ap.add_argument("--selftest", action="store_true", help="Run built-in tests and exit")
     return ap.parse_args(argv)
@@ -389,6 +720,8 @@ def main(argv: List[str]) -> int:
             model=str(args.model),
             temperature=float(args.temperature),
             debug=bool(args.debug),
+            batch_size=max(1, int(args.batch_size)),
+            workers=max(1, int(args.workers)),
         )
     except KeyboardInterrupt:
         print("Interrupted.")
@@ -11,80 +11,235 @@ keywords before uploading to the selected marketplaces.
 from __future__ import annotations
 
 import argparse
+import mimetypes
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 
-from stockmate import AIGenerator, SUPPORTED_EXTS
+try:  # optional: streams multipart bodies from disk instead of buffering them
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except Exception:  # pragma: no cover
+    MultipartEncoder = None  # type: ignore
 
+from stockmate import AIGenerator, iter_images
 
-def _iter_images(folder: Path) -> Iterable[Path]:
-    for p in folder.rglob("*"):
-        if p.suffix.lower() in SUPPORTED_EXTS:
-            yield p
 
+class TokenBucket:
+    """Thread-safe token bucket: bursts of up to ``capacity`` calls, then ``rate`` per second."""
 
-def upload_shutterstock(img: Path, meta) -> dict:
-    token = os.getenv("SHUTTERSTOCK_TOKEN")
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Opt-in per-agency throttles (see --rate-limit); empty means uploads are not throttled.
+RATE_LIMITS: Dict[str, TokenBucket] = {}
+
+
+def _throttle(site: str) -> None:
+    bucket = RATE_LIMITS.get(site)
+    if bucket is not None:
+        bucket.acquire()
+
+
+def _post_image(http, url: str, headers: dict, img: Path, data: dict) -> requests.Response:
+    """POST ``img`` as the multipart ``file`` field alongside ``data``; closes the file afterwards."""
+    with img.open("rb") as fh:
+        if MultipartEncoder is not None:
+            mime = mimetypes.guess_type(img.name)[0] or "application/octet-stream"
+            body = MultipartEncoder(fields={**data, "file": (img.name, fh, mime)})
+            headers = {**headers, "Content-Type": body.content_type}
+            return http.post(url, headers=headers, data=body, timeout=30)
+        return http.post(url, headers=headers, files={"file": fh}, data=data, timeout=30)
+
+
+def _auth_headers(env_var: str) -> dict:
+    token = os.getenv(env_var)
     if not token:
-        raise RuntimeError("SHUTTERSTOCK_TOKEN not set")
-    headers = {"Authorization": f"Bearer {token}"}
-    files = {"file": img.open("rb")}
-    data = {
+        raise RuntimeError(f"{env_var} not set")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def form_fields(meta, max_kw: Optional[int] = None) -> dict:
+    """Form fields shared by both agencies; build once per image and pass as ``fields``."""
+    return {
         "title": meta.title,
         "description": meta.description,
-        "keywords": ",".join(meta.merged_keywords("en")),
+        "keywords": ",".join(islice(meta.merged_keywords("en"), max_kw)),
     }
-    resp = requests.post(
+
+
+def upload_shutterstock(
+    img: Path, meta, session: Optional[requests.Session] = None, fields: Optional[dict] = None
+) -> dict:
+    headers = _auth_headers(TOKEN_ENV["shutterstock"])
+    data = fields if fields is not None else form_fields(meta)
+    _throttle("shutterstock")
+    resp = _post_image(
+        session or requests,
         "https://contributor-api.shutterstock.com/v2/images",  # official endpoint may differ
-        headers=headers,
-        files=files,
-        data=data,
-        timeout=30,
+        headers,
+        img,
+        data,
     )
     resp.raise_for_status()
     return resp.json()
 
 
-def upload_adobe(img: Path, meta) -> dict:
-    token = os.getenv("ADOBE_TOKEN")
-    if not token:
-        raise RuntimeError("ADOBE_TOKEN not set")
-    headers = {"Authorization": f"Bearer {token}"}
-    files = {"file": img.open("rb")}
-    data = {
-        "title": meta.title,
-        "description": meta.description,
-        "keywords": ",".join(meta.merged_keywords("en")),
-    }
-    resp = requests.post(
+def upload_adobe(
+    img: Path, meta, session: Optional[requests.Session] = None, fields: Optional[dict] = None
+) -> dict:
+    headers = _auth_headers(TOKEN_ENV["adobe"])
+    data = fields if fields is not None else form_fields(meta)
+    _throttle("adobe")
+    resp = _post_image(
+        session or requests,
         "https://stock.adobe.io/Rest/Media/Upload",  # official endpoint may differ
-        headers=headers,
-        files=files,
-        data=data,
-        timeout=30,
+        headers,
+        img,
+        data,
     )
     resp.raise_for_status()
     return resp.json()
 
 
+UPLOADERS = {"shutterstock": upload_shutterstock, "adobe": upload_adobe}
+TOKEN_ENV = {"shutterstock": "SHUTTERSTOCK_TOKEN", "adobe": "ADOBE_TOKEN"}
+
+
+# Built once at import. Only connection failures are retried: the request never
+# reached the agency, so an image cannot be submitted twice.
+_RETRY = Retry(total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.5)
+
+
+def _make_session(pool_size: int) -> requests.Session:
+    """Session whose per-host connection pool fits ``pool_size`` concurrent uploads."""
+    session = requests.Session()
+    # requests keeps at most 10 connections per host; beyond that they are discarded.
+    adapter = HTTPAdapter(pool_connections=len(UPLOADERS), pool_maxsize=max(10, pool_size), max_retries=_RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _process_one(
+    ai: AIGenerator,
+    img: Path,
+    uploaders: List[Callable[..., dict]],
+    max_kw: int,
+    upload_ex: ThreadPoolExecutor,
+) -> None:
+    meta = ai.for_image(img, max_kw=max_kw)
+    fields = form_fields(meta, max_kw)
+    # The agencies are independent hosts, so post to all of them at once.
+    for fut in [upload_ex.submit(upload, img, meta, fields=fields) for upload in uploaders]:
+        fut.result()
+
+
+def run_selftests() -> int:
+    print("=== RUNNING SELFTESTS (no network) ===")
+    # 1) No throttling unless --rate-limit is given
+    assert not RATE_LIMITS
+
+    # 2) TokenBucket allows a burst of ``capacity`` calls, then refills at ``rate``
+    bucket = TokenBucket(20, capacity=3)
+    t0 = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - t0 < 0.04
+    bucket.acquire()  # bucket empty: waits ~1/20 s for a token
+    assert time.monotonic() - t0 >= 0.04
+
+    # 3) An idle bucket refills only up to ``capacity``
+    time.sleep(0.25)  # worth 5 tokens at 20/s
+    t0 = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - t0 < 0.04
+    bucket.acquire()
+    assert time.monotonic() - t0 >= 0.04
+
+    print("ALL TESTS PASSED")
+    return 0
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Auto-upload images to stock sites")
     ap.add_argument("folder", type=Path, help="Folder containing images")
     ap.add_argument("--site", choices=["shutterstock", "adobe", "both"], default="both")
     ap.add_argument("--max-kw", type=int, default=30, help="Max keywords per image")
+    ap.add_argument("--workers", type=int, default=8, help="Images processed concurrently (default 8)")
+    ap.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Max uploads per second to each agency (default: no limit)",
+    )
+    ap.add_argument("--selftest", action="store_true", help="Run built-in tests and exit")
     args = ap.parse_args()
 
+    if args.selftest:
+        raise SystemExit(run_selftests())
+    if args.rate_limit is not None and args.rate_limit <= 0:
+        ap.error("--rate-limit must be positive")
+
+    sites = [name for name in UPLOADERS if args.site in {name, "both"}]
+    # Fail before any (billed) metadata generation if a token is missing.
+    missing = [TOKEN_ENV[name] for name in sites if not os.getenv(TOKEN_ENV[name])]
+    if missing:
+        ap.error(f"{', '.join(missing)} not set")
+
+    images = list(iter_images(args.folder))
+    if not images:
+        return
+
+    if args.rate_limit is not None:
+        RATE_LIMITS.update({name: TokenBucket(args.rate_limit) for name in sites})
+    selected = [UPLOADERS[name] for name in sites]
+    workers = max(1, min(args.workers, len(images)))
     ai = AIGenerator()
-    for img in tqdm(list(_iter_images(args.folder)), desc="Uploading", unit="img"):
-        meta = ai.for_image(img, max_kw=args.max_kw)
-        if args.site in {"shutterstock", "both"}:
-            upload_shutterstock(img, meta)
-        if args.site in {"adobe", "both"}:
-            upload_adobe(img, meta)
+    # Metadata generation and uploads are network-bound, so small thread
+    # pools overlap the round-trips. Tune --workers to your OpenAI rate limit.
+    # One Session keeps connections to each agency alive across uploads.
+    # Exit order matters: the image pool (ex) is closed first, so images already
+    # past their model call can still hand uploads to upload_ex.
+    with _make_session(workers) as session, \
+            ThreadPoolExecutor(max_workers=workers * len(selected)) as upload_ex, \
+            ThreadPoolExecutor(max_workers=workers) as ex:
+        uploaders = [partial(fn, session=session) for fn in selected]
+        futures = [ex.submit(_process_one, ai, img, uploaders, args.max_kw, upload_ex) for img in images]
+        try:
+            for fut in tqdm(as_completed(futures), total=len(futures), desc="Uploading", unit="img"):
+                fut.result()
+        except BaseException:
+            # Includes KeyboardInterrupt: drop queued images so no more model calls are paid for.
+            ex.shutdown(wait=False, cancel_futures=True)
+            raise
 
 
 if __name__ == "__main__":  # pragma: no cover